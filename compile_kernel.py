@@ -0,0 +1,24 @@
+"""
+compile_kernel.py
+
+This script compiles the monthly simulation loop ahead of time with Numba,
+into the 'tokenomics_kernel' extension module next to 'simulation.py'.
+When the module is present, 'simulate' uses it instead of compiling the loop
+at run time, so even the first simulation of a session starts immediately.
+
+The module must be rebuilt after changing the simulation loop.
+
+Usage:
+    python compile_kernel.py
+"""
+
+from pathlib import Path
+from numba.pycc import CC
+from simulation import KERNEL_SIGNATURE, _simulate_months
+
+cc = CC('tokenomics_kernel')
+cc.output_dir = str(Path(__file__).resolve().parent)
+cc.export('simulate_months', KERNEL_SIGNATURE)(_simulate_months.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
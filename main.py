@@ -3,125 +3,268 @@ main.py
 
 This script runs the PoLN tokenomics simulation and outputs the results.
 It reads the configuration parameters from 'config.json', runs the simulation,
-saves the results to CSV files, generates plots, and prints a summary of results.
+saves the results to data files, generates plots, and prints a summary of results.
 
 Usage:
     python main.py
 """
 
-import json
-import os
-import matplotlib.pyplot as plt
+from contextlib import ExitStack
+from pathlib import Path
+import orjson
 from simulation import simulate
 
+# matplotlib and pyarrow.csv are imported where they are used, so runs that
+# do not plot or write CSV files do not pay for importing them
+
+# Resolution of the saved plots, enough for simulation diagnostics
+PLOT_DPI = 100
+
+# Directory receiving data files and plots
+RESULTS_DIR = Path('results')
+
+OUTPUT_FORMATS = ('feather', 'parquet', 'csv')
+PLOT_FORMATS = ('png', 'pdf')
+
+# Subplots of the result figure, in row-major order:
+# (title, y-axis label, ((column, legend label, color), ...)).
+# '{years}' in a title is replaced by the simulated duration.
+PLOT_SPECS = (
+    ('Token Price Over {years} Years', 'Token Price ($)', (
+        ('Token Price', 'Token Price', 'blue'),
+    )),
+    ('Circulating Supply and Total Burnt Tokens', 'Tokens', (
+        ('Circulating Supply', 'Circulating Supply', 'orange'),
+        ('Total Burnt Tokens', 'Total Burnt Tokens', 'green'),
+    )),
+    ('Market Sentiment Index Over {years} Years', 'MSI', (
+        ('Market Sentiment Index', 'Market Sentiment Index', 'purple'),
+    )),
+    ('Missions Conducted', 'Number of Missions', (
+        ('Missions', 'Missions Conducted', 'red'),
+    )),
+    ('DAO Treasury', 'Tokens', (
+        ('DAO Treasury', 'DAO Treasury', 'cyan'),
+    )),
+    ('Initiator Rewards Pool', 'Tokens', (
+        ('Initiator Rewards Pool', 'Initiator Rewards Pool', 'brown'),
+    )),
+)
+
+
+def run_all(config):
+    """
+    Run the simulation for every duration listed in 'simulation_years'.
+
+    Each month only depends on the months before it, so the simulation is run
+    once for the longest duration and the shorter durations are taken as the
+    first months of that run.
+
+    Parameters:
+    - config: dict, configuration parameters loaded from 'config.json'.
+
+    Returns:
+    - runs: list of (years, df) tuples, in the order of 'simulation_years'.
+    """
+    months_per_year = config['months_per_year']
+    max_months = max(config['simulation_years']) * months_per_year
+    df_full = simulate(max_months, config)
+
+    return [
+        (years, df_full.iloc[:years * months_per_year].copy())
+        for years in config['simulation_years']
+    ]
+
+
+def _check_format(name, value, allowed):
+    """
+    Raise a ValueError if a format option is not one of its allowed values.
+
+    Parameters:
+    - name: str, configuration key of the option.
+    - value: str, configured format.
+    - allowed: tuple of str, formats supported for the option.
+    """
+    if value not in allowed:
+        raise ValueError(
+            f"Unknown {name} '{value}', "
+            f"expected one of {', '.join(allowed)}"
+        )
+
+
+def save_results(df, path, output_format):
+    """
+    Save simulation results in the requested file format.
+
+    Parameters:
+    - df: pandas DataFrame containing the simulation results.
+    - path: pathlib.Path, file to write.
+    - output_format: str, one of 'feather', 'parquet' or 'csv'.
+    """
+    _check_format('output_format', output_format, OUTPUT_FORMATS)
+
+    # Open the file once and let the writer stream into the handle
+    with path.open('wb') as data_file:
+        if output_format == 'feather':
+            df.to_feather(data_file)
+        elif output_format == 'parquet':
+            df.to_parquet(data_file, index=False, compression='zstd')
+        else:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False),
+                            data_file)
+
+
+def create_figure():
+    """
+    Create the figure used to plot every simulation duration.
+
+    Returns:
+    - fig: matplotlib Figure, 2 rows x 3 columns in landscape orientation.
+    - axes: numpy array of the figure's Axes.
+    """
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    # Simplify long line paths before rasterization
+    matplotlib.rcParams['path.simplify'] = True
+    matplotlib.rcParams['path.simplify_threshold'] = 1.0
+    # Draw long paths in chunks instead of as a single Agg path
+    matplotlib.rcParams['agg.path.chunksize'] = 10000
+
+    # Figures are only saved to files, so they are created without pyplot
+    # and never registered with a GUI backend
+    # Wider figure for landscape orientation, 2 rows x 3 columns
+    fig = Figure(figsize=(20, 10))
+    axes = fig.subplots(2, 3)
+
+    # Decorations that do not depend on the duration are set once
+    for ax, (title, ylabel, _) in zip(axes.flat, PLOT_SPECS):
+        ax.set_title(title)
+        ax.set_xlabel('Month')
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+
+    return fig, axes
+
+
+def plot_results(fig, axes, df, years):
+    """
+    Draw the results of one simulation duration on the shared figure.
+
+    Parameters:
+    - fig: matplotlib Figure returned by create_figure().
+    - axes: numpy array of Axes returned by create_figure().
+    - df: pandas DataFrame containing the simulation results.
+    - years: int, simulated duration in years.
+    """
+    month = df['Month'].to_numpy()
+
+    for ax, (title, _, series) in zip(axes.flat, PLOT_SPECS):
+        columns, labels, colors = zip(*series)
+
+        # Remove the previous duration's lines, the axes themselves are reused
+        for line in list(ax.lines):
+            line.remove()
+
+        # All series of a subplot are drawn with a single plot call
+        ax.set_prop_cycle(color=colors)
+        ax.plot(month, df[list(columns)].to_numpy(), label=list(labels))
+        if '{years}' in title:
+            ax.set_title(title.format(years=years))
+
+        # Rescale to the new lines and rebuild the legend
+        ax.relim()
+        ax.autoscale_view()
+        ax.legend()
+
+    # Adjust layout
+    fig.tight_layout()
+
+
+def print_summary(df, years):
+    """
+    Print the interpretation of the results of one simulation duration.
+
+    Parameters:
+    - df: pandas DataFrame containing the simulation results.
+    - years: int, simulated duration in years.
+    """
+    # Interpretation of Results
+    print(f"\n--- \033[7;32mInterpretation after {years} years\033[0m ---")
+    final = df.iloc[-1]
+    final_price = final['Token Price']
+    final_supply = final['Circulating Supply']
+    final_total_supply = final['Total Supply']
+    total_burnt = final['Total Burnt Tokens']
+    dao_balance = final['DAO Treasury']
+    print(f"Final Token Price: ${final_price:.2f}")
+    print(f"Final Total Supply: {final_total_supply:,.2f} tokens")
+    print(f"Final Circulating Supply: {final_supply:,.2f} tokens")
+    print(f"Total Tokens Burnt: {total_burnt:,.2f} tokens")
+    print(f"DAO Treasury Balance: {dao_balance:,.2f} tokens")
+    print("----------------------------------------")
+
 
 def main():
     """
     Main function to execute the tokenomics simulation and handle output.
     """
     # Load configuration
-    with open('config.json', 'r', encoding='utf-8') as config_file:
-        config = json.load(config_file)
+    with open('config.json', 'rb') as config_file:
+        config = orjson.loads(config_file.read())
 
     # Improved directory creation
-    os.makedirs('results', exist_ok=True)
-
-    # Run simulations for each specified duration
-    for years in config['simulation_years']:
-        simulation_months = years * config['months_per_year']
-        df = simulate(simulation_months, config)
-
-        # Save results to CSV
-        csv_filename = f'results/simulation_data_{years}yrs.csv'
-        df.to_csv(csv_filename, index=False)
-
-        # Plot results in landscape orientation
-        plt.figure(figsize=(20, 10))  # Wider figure for landscape orientation
-
-        # Subplot arrangement: 2 rows x 3 columns
-        # Subplot 1: Token Price
-        plt.subplot(2, 3, 1)
-        plt.plot(df['Month'], df['Token Price'],
-                 label='Token Price', color='blue')
-        plt.title(f'Token Price Over {years} Years')
-        plt.xlabel('Month')
-        plt.ylabel('Token Price ($)')
-        plt.grid(True)
-        plt.legend()
-
-        # Subplot 2: Circulating Supply and Total Burnt Tokens
-        plt.subplot(2, 3, 2)
-        plt.plot(df['Month'], df['Circulating Supply'],
-                 label='Circulating Supply', color='orange')
-        plt.plot(df['Month'], df['Total Burnt Tokens'],
-                 label='Total Burnt Tokens', color='green')
-        plt.title('Circulating Supply and Total Burnt Tokens')
-        plt.xlabel('Month')
-        plt.ylabel('Tokens')
-        plt.grid(True)
-        plt.legend()
-
-        # Subplot 3: Market Sentiment Index (MSI)
-        plt.subplot(2, 3, 3)
-        plt.plot(df['Month'], df['Market Sentiment Index'],
-                 label='Market Sentiment Index', color='purple')
-        plt.title(f'Market Sentiment Index Over {years} Years')
-        plt.xlabel('Month')
-        plt.ylabel('MSI')
-        plt.grid(True)
-        plt.legend()
-
-        # Subplot 4: Missions Conducted
-        plt.subplot(2, 3, 4)
-        plt.plot(df['Month'], df['Missions'],
-                 label='Missions Conducted', color='red')
-        plt.title('Missions Conducted')
-        plt.xlabel('Month')
-        plt.ylabel('Number of Missions')
-        plt.grid(True)
-        plt.legend()
-
-        # Subplot 5: DAO Treasury
-        plt.subplot(2, 3, 5)
-        plt.plot(df['Month'], df['DAO Treasury'],
-                 label='DAO Treasury', color='cyan')
-        plt.title('DAO Treasury')
-        plt.xlabel('Month')
-        plt.ylabel('Tokens')
-        plt.grid(True)
-        plt.legend()
-
-        # Subplot 6: Initiator Rewards Pool
-        plt.subplot(2, 3, 6)
-        plt.plot(df['Month'], df['Initiator Rewards Pool'],
-                 label='Initiator Rewards Pool', color='brown')
-        plt.title('Initiator Rewards Pool')
-        plt.xlabel('Month')
-        plt.ylabel('Tokens')
-        plt.grid(True)
-        plt.legend()
-
-        # Adjust layout
-        plt.tight_layout()
-
-        # Save plot
-        plot_filename = f'results/simulation_{years}yrs.png'
-        plt.savefig(plot_filename)
-        plt.close()
-
-        # Interpretation of Results
-        print(f"\n--- \033[7;32mInterpretation after {years} years\033[0m ---")
-        final_price = df['Token Price'].iloc[-1]
-        final_supply = df['Circulating Supply'].iloc[-1]
-        final_total_supply = df['Total Supply'].iloc[-1]
-        total_burnt = df['Total Burnt Tokens'].iloc[-1]
-        dao_balance = df['DAO Treasury'].iloc[-1]
-        print(f"Final Token Price: ${final_price:.2f}")
-        print(f"Final Total Supply: {final_total_supply:,.2f} tokens")
-        print(f"Final Circulating Supply: {final_supply:,.2f} tokens")
-        print(f"Total Tokens Burnt: {total_burnt:,.2f} tokens")
-        print(f"DAO Treasury Balance: {dao_balance:,.2f} tokens")
-        print("----------------------------------------")
+    RESULTS_DIR.mkdir(exist_ok=True)
+
+    # Saving and plotting can be turned off for batch runs
+    save_data = config.get('save_data', True)
+    plot = config.get('plot', True)
+
+    # Shorter durations are the first months of the longest one, so their
+    # data files can be skipped when only the longest file is consumed
+    save_all_durations = config.get('save_all_durations', True)
+    max_years = max(config['simulation_years'])
+
+    # Formats are checked before running the simulation
+    output_format = config.get('output_format', 'feather')
+    _check_format('output_format', output_format, OUTPUT_FORMATS)
+    plot_format = config.get('plot_format', 'png')
+    _check_format('plot_format', plot_format, PLOT_FORMATS)
+
+    # With 'pdf', every duration is written as a page of a single document
+    pdf = None
+    # The document is closed even if a duration fails
+    with ExitStack() as stack:
+        if plot:
+            # One figure is shared by all durations
+            fig, axes = create_figure()
+            if plot_format == 'pdf':
+                from matplotlib.backends.backend_pdf import PdfPages
+                pdf = stack.enter_context(
+                    PdfPages(RESULTS_DIR / 'simulation.pdf'))
+
+        # Run simulations for each specified duration
+        for years, df in run_all(config):
+            if save_data and (save_all_durations or years == max_years):
+                # Save results in the configured format
+                data_path = (RESULTS_DIR /
+                             f'simulation_data_{years}yrs.{output_format}')
+                save_results(df, data_path, output_format)
+
+            if plot:
+                plot_results(fig, axes, df, years)
+
+                # Save plot
+                if pdf is not None:
+                    pdf.savefig(fig)
+                else:
+                    plot_path = RESULTS_DIR / f'simulation_{years}yrs.png'
+                    with plot_path.open('wb') as plot_file:
+                        fig.savefig(plot_file, format='png', dpi=PLOT_DPI)
+
+            print_summary(df, years)
 
 
 if __name__ == '__main__':
@@ -3,199 +3,336 @@ simulation.py
 
 This module contains the simulation logic for the $POLN tokenomics model.
 It defines the 'simulate' function, which runs the simulation based on the
-configuration parameters provided.
+configuration parameters provided. The month-by-month loop runs from the
+ahead-of-time module built by 'compile_kernel.py' when present, is compiled
+with Numba when it is installed, and runs as plain Python otherwise.
+
+Classes:
+    SimConfig
 
 Functions:
-    simulate(simulation_months, config) -> pd.DataFrame
+    simulate(simulation_months, config, rng=None, seed=None,
+             as_pandas=True) -> pd.DataFrame
+    simulate_ensemble(num_replicates, simulation_months, config, rng=None,
+                      seed=None, as_pandas=True) -> pd.DataFrame
 """
 
-import random
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 
-
-def simulate(simulation_months, config):
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # Numba is optional, the loop then runs as plain Python
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+# Columns of the simulation results and their dtypes, in the order of the
+# DataFrame. Month and halving counters are 32-bit integers, while missions,
+# which grow with the configured carrying capacity, are 64-bit. Amounts of a
+# single month are stored in single precision, while balances and running
+# totals stay in double precision, like all the state of the simulation
+# loop.
+RESULT_DTYPE = np.dtype([
+    ('Month', np.int32),
+    ('Circulating Supply', np.float64),
+    ('Total Supply', np.float64),
+    ('Token Price', np.float64),
+    ('Tokens Staked', np.float32),
+    ('Tokens Burnt', np.float32),
+    ('Tokens Fee Distributed', np.float32),
+    ('Tokens Fee to DAO', np.float32),
+    ('DAO Treasury', np.float64),
+    ('Total Burnt Tokens', np.float64),
+    ('Market Sentiment Index', np.float32),
+    ('Net Token Demand', np.float32),
+    ('Missions', np.int64),
+    ('Initiator Rewards Pool', np.float64),
+    ('Reward per Mission', np.float32),
+    ('Halving Index', np.int32),
+    ('Builders Sold', np.float32),
+    ('Fellowship Sold', np.float32),
+])
+RESULT_COLUMNS = RESULT_DTYPE.names
+
+# Scalar inputs of the simulation loop, in the order of its 'params' vector
+KERNEL_PARAMS = (
+    'total_supply',
+    'project_cost',
+    'protocol_fee_rate',
+    'staking_rate',
+    'pec',
+    'initiator_selling_percentage',
+    'dao_consumption_monthly_rate',
+    'dao_consumption_start_month',
+    'fellowship_selling_percentage',
+    'builders_selling_percentage',
+    'minimum_reward_per_mission',
+    'max_halvings',
+    'circulating_supply',
+    'dao_treasury',
+    'initiator_rewards_pool',
+    'token_price',
+    'reward_per_mission',
+)
+# Precomputed monthly schedules, in the order of the rows of 'schedules'
+KERNEL_SCHEDULES = (
+    'builders_vesting',
+    'builders_remaining',
+    'testnet_vesting',
+    'testnet_remaining',
+    'private_sales_vesting',
+    'private_sales_schedules_remaining',
+)
+
+# Numba signature of '_simulate_months', used to compile it ahead of time
+KERNEL_SIGNATURE = (
+    'void(f8[:], f8[:, :], f8[:, :], f8[:], i8[:], i8[:], f8[:, :])'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SimConfig:
     """
-    Run the tokenomics simulation for a specified number of months.
-
-    Parameters:
-    - simulation_months: int, total number of months to simulate.
-    - config: dict, configuration parameters loaded from 'config.json'.
+    Simulation parameters, read once from the configuration.
 
-    Returns:
-    - df: pandas DataFrame containing the simulation results.
+    Fields are named after the keys of 'config.json' they are read from.
+    Nested values are stored as tuples, so a SimConfig is hashable and keys
+    the caches of prepared inputs and seeded results. Keys that only control
+    the output, such as 'plot' or 'output_format', are not part of it.
     """
+    total_supply: float
+    initial_price: float
+    project_cost: float
+    protocol_fee_rate: float
+    staking_rate: float
+    mission_success_rate: float
+    pec: float  # Price Elasticity Coefficient
+    msi_bull: float
+    msi_bear: float
+    msi_normal: float
+    roadmap_effect: float
+    roadmap_cycle: int
+    bull_market_probability: float
+    bear_market_probability: float
+    market_event_duration: int
+    random_fluctuation: float
+    carrying_capacity: float
+    growth_rate: float
+    inflection_point: float
+    # Seasonal factors indexed by month of year, January first
+    seasonality: tuple
+    # (group, share of the total supply) pairs
+    token_distribution: tuple
+    builders_lockup_period: int
+    builders_vesting_period: int
+    builders_selling_percentage: float
+    testnet_distribution_period: float
+    initiator_selling_percentage: float
+    dao_annual_consumption_rate: float
+    dao_consumption_start_month: int
+    fellowship_selling_percentage: float
+    # (tokens_sold, vesting_period) pairs, one per sale
+    private_sales: tuple
+    # Monthly entry of 'initiator_rewards_initial'
+    initial_reward_per_mission: float
+    minimum_reward_per_mission: float
+    seed: int | None = None
+
+    @classmethod
+    def from_dict(cls, config):
+        """
+        Read the simulation parameters from a configuration dict.
+
+        Parameters:
+        - config: dict, configuration parameters loaded from 'config.json'.
+
+        Returns:
+        - cfg: SimConfig, parameters of the simulation.
+        """
+        seasonality = config['seasonality']
+        return cls(
+            total_supply=config['total_supply'],
+            initial_price=config['initial_price'],
+            project_cost=config['project_cost'],
+            protocol_fee_rate=config['protocol_fee_rate'],
+            staking_rate=config['staking_rate'],
+            mission_success_rate=config['mission_success_rate'],
+            pec=config['pec'],
+            msi_bull=config['msi_bull'],
+            msi_bear=config['msi_bear'],
+            msi_normal=config['msi_normal'],
+            roadmap_effect=config['roadmap_effect'],
+            roadmap_cycle=config['roadmap_cycle'],
+            bull_market_probability=config['bull_market_probability'],
+            bear_market_probability=config['bear_market_probability'],
+            market_event_duration=config['market_event_duration'],
+            random_fluctuation=config['random_fluctuation'],
+            carrying_capacity=config['carrying_capacity'],
+            growth_rate=config['growth_rate'],
+            inflection_point=config['inflection_point'],
+            seasonality=tuple(seasonality.get(str(month), 1.0)
+                              for month in range(1, 13)),
+            token_distribution=tuple(config['token_distribution'].items()),
+            builders_lockup_period=config['builders_lockup_period'],
+            builders_vesting_period=config['builders_vesting_period'],
+            builders_selling_percentage=config['builders_selling_percentage'],
+            testnet_distribution_period=config['testnet_distribution_period'],
+            initiator_selling_percentage=(
+                config['initiator_selling_percentage']),
+            dao_annual_consumption_rate=config['dao_annual_consumption_rate'],
+            dao_consumption_start_month=config['dao_consumption_start_month'],
+            fellowship_selling_percentage=(
+                config['fellowship_selling_percentage']),
+            private_sales=tuple((sale['tokens_sold'], sale['vesting_period'])
+                                for sale in config['private_sales']),
+            initial_reward_per_mission=(
+                config['initiator_rewards_initial']['monthly']),
+            minimum_reward_per_mission=config['minimum_reward_per_mission'],
+            seed=config.get('seed'),
+        )
 
-    # Extract parameters from the configuration
-    total_supply = config['total_supply']
-    initial_price = config['initial_price']
-    project_cost = config['project_cost']
-    protocol_fee_rate = config['protocol_fee_rate']
-    staking_rate = config['staking_rate']
-    mission_success_rate = config['mission_success_rate']
-    pec = config['pec']  # Price Elasticity Coefficient
-    msi_bull = config['msi_bull']
-    msi_bear = config['msi_bear']
-    msi_normal = config['msi_normal']
-    roadmap_effect = config['roadmap_effect']
-    roadmap_cycle = config['roadmap_cycle']
-    bull_market_probability = config['bull_market_probability']
-    bear_market_probability = config['bear_market_probability']
-    market_event_duration = config['market_event_duration']
-    random_fluctuation = config['random_fluctuation']
-    carrying_capacity = config['carrying_capacity']
-    growth_rate = config['growth_rate']
-    inflection_point = config['inflection_point']
-    seasonality = config['seasonality']
-    token_distribution = config['token_distribution']
-    initiator_selling_percentage = config['initiator_selling_percentage']
-    dao_annual_consumption_rate = config['dao_annual_consumption_rate']
-    dao_consumption_start_month = config['dao_consumption_start_month']
-    fellowship_selling_percentage = config['fellowship_selling_percentage']
-    builders_selling_percentage = config['builders_selling_percentage']
-    private_sales = config['private_sales']
-    initial_rewards = config['initiator_rewards_initial']
-    minimum_reward_per_mission = config['minimum_reward_per_mission']
-    testnet_distribution_period = config['testnet_distribution_period']
-    builders_lockup_period = config['builders_lockup_period']
-    builders_vesting_period = config['builders_vesting_period']
-
-    # Initialize state variables
-    total_supply_current = total_supply  # Keep total supply constant
 
-    # Tokens allocated
-    builders_tokens_total = total_supply * token_distribution['Builders']
-    builders_tokens_remaining = builders_tokens_total
-    dao_treasury = total_supply * token_distribution['DAO Treasury']
-    airdrops_giveaways_tokens = total_supply * \
-        token_distribution['Airdrops & Giveaways']
-    # Initiator rewards pool calculated from token distribution
-    initiator_rewards_pool = total_supply * \
-        token_distribution['Initiator Rewards']
-    testnet_development_tokens = (
-        total_supply * token_distribution['Testnet Development & Partners']
-    )
+try:
+    # Ahead-of-time compiled loop, built by 'python compile_kernel.py'
+    from tokenomics_kernel import simulate_months as _compiled_months
+except ImportError:
+    _compiled_months = None
 
-    # Calculate private sale tokens under vesting
-    private_sale_vesting_tokens_total = sum(
-        sale['tokens_sold'] for sale in private_sales
-    )
-    private_sale_vesting_tokens_remaining = private_sale_vesting_tokens_total
 
-    # Circulating supply excludes tokens not immediately available
-    circulating_supply = total_supply - (
-        builders_tokens_remaining +
-        dao_treasury +
-        airdrops_giveaways_tokens +
-        initiator_rewards_pool +
-        testnet_development_tokens +
-        private_sale_vesting_tokens_remaining
-    )
+@njit(cache=True)
+def _market_sentiment(event_types, msi_table, event_counters,
+                      roadmap_effect, roadmap_cycle):
+    """
+    Compute the Market Sentiment Index (MSI) of every month.
 
-    # Initialize private sales vesting schedules
-    private_sales_vesting_schedules = []
-    for sale in private_sales:
-        vesting_period = sale['vesting_period']
-        tokens_sold = sale['tokens_sold']
-        vesting_amount_per_month = tokens_sold / \
-            vesting_period if vesting_period > 0 else 0
-        private_sales_vesting_schedules.append({
-            'remaining_tokens': tokens_sold,
-            'vesting_period': vesting_period,
-            'vesting_amount_per_month': vesting_amount_per_month,
-            'current_month': 0,
-        })
-        if vesting_period == 0:
-            # Tokens with no vesting are added to circulating supply immediately
-            circulating_supply += tokens_sold
-            private_sale_vesting_tokens_remaining -= tokens_sold
+    Market events only depend on the random draws, not on the state of the
+    token economy, so the whole MSI series is computed before the loop.
 
-    total_burnt_tokens = 0
-    token_price = initial_price
+    Parameters:
+    - event_types: int64 array of shape (runs, simulation_months), market
+      event starting if no event is ongoing, one row per run: 0 for bull,
+      1 for bear and 2 for normal market.
+    - msi_table: float64 array, MSI of every event type.
+    - event_counters: int64 array, months an event of every type lasts
+      after the month it starts.
+    - roadmap_effect, roadmap_cycle: roadmap parameters from the
+      configuration.
 
-    # Data storage for simulation results
-    results = []
+    Returns:
+    - msi: float64 array of the same shape as 'event_types'.
+    """
+    msi = np.empty(event_types.shape)
+    for run in range(event_types.shape[0]):
+        # Market event tracking
+        market_event_counter = 0  # Tracks duration of current market event
+
+        for month in range(1, event_types.shape[1] + 1):
+            if market_event_counter > 0:
+                market_event_counter -= 1  # Continue current market event
+            else:
+                # A new market event (or a normal month) starts
+                event_type = event_types[run, month - 1]
+                current_msi = msi_table[event_type]
+                market_event_counter = event_counters[event_type]
 
-    # Builders' tokens vesting per month after lockup
-    builders_vesting_per_month = builders_tokens_total / \
-        builders_vesting_period if builders_vesting_period > 0 else 0
+            if month % roadmap_cycle == 0:
+                current_msi *= roadmap_effect
 
-    # DAO consumption tracking
-    dao_consumption_monthly_rate = dao_annual_consumption_rate / \
-        12  # Convert annual rate to monthly
+            msi[run, month - 1] = current_msi
+    return msi
 
-    # Initiator rewards
-    # Start with monthly reward
-    reward_per_mission = initial_rewards['monthly']
-    initial_initiator_rewards_pool = initiator_rewards_pool
-    current_halving_index = 0
 
-    # Compute the maximum number of halvings
-    max_halvings = int(
-        np.floor(np.log2(initial_initiator_rewards_pool /
-                 minimum_reward_per_mission))
-    )
+@njit(cache=True)
+def _simulate_months(params, schedules, halving_table, market_sentiment,
+                     missions, successful_missions, out):
+    """
+    Run the month-by-month simulation loop.
 
-    # Market event tracking
-    market_event_counter = 0  # Tracks duration of current market event
-    current_msi = msi_normal  # Start with normal market sentiment
+    Parameters:
+    - params: float64 array of the scalar inputs named in KERNEL_PARAMS.
+    - schedules: float64 array of shape
+      (len(KERNEL_SCHEDULES), simulation_months), one row per schedule. The
+      vesting schedules give the tokens vested during each month and still
+      locked after it. 'private_sales_schedules_remaining' gives the
+      remaining tokens of all private sale schedules, including sales that
+      were not vested.
+    - halving_table: float64 array of shape (2, max_halvings + 1), indexed
+      by the halving index. Row 0 is the initiator rewards pool below which
+      the next halving occurs, row 1 the reward per mission after it.
+    - market_sentiment: float64 array of the Market Sentiment Index,
+      indexed by month - 1.
+    - missions, successful_missions: int64 arrays of missions conducted
+      and of successful missions, indexed by month - 1.
+    - out: float64 array of shape (len(RESULT_COLUMNS), simulation_months),
+      filled with one row per result column and one column per month.
+    """
+    # Unpack the inputs, in the order of KERNEL_PARAMS and KERNEL_SCHEDULES
+    total_supply = params[0]
+    project_cost = params[1]
+    protocol_fee_rate = params[2]
+    staking_rate = params[3]
+    pec = params[4]
+    initiator_selling_percentage = params[5]
+    dao_consumption_monthly_rate = params[6]
+    dao_consumption_start_month = int(params[7])
+    fellowship_selling_percentage = params[8]
+    builders_selling_percentage = params[9]
+    minimum_reward_per_mission = params[10]
+    max_halvings = int(params[11])
+    circulating_supply = params[12]
+    dao_treasury = params[13]
+    initiator_rewards_pool = params[14]
+    token_price = params[15]
+    reward_per_mission = params[16]
+    builders_vesting = schedules[0]
+    builders_remaining = schedules[1]
+    testnet_vesting = schedules[2]
+    testnet_remaining = schedules[3]
+    private_sales_vesting = schedules[4]
+    private_sales_schedules_remaining = schedules[5]
+    simulation_months = out.shape[1]
+
+    total_supply_current = total_supply  # Keep total supply constant
+    total_burnt_tokens = 0.0
+    current_halving_index = 0
+    # Protocol fee per mission in USD, the same every month
+    protocol_fee_usd = project_cost * protocol_fee_rate
 
     # Main simulation loop
     for month in range(1, simulation_months + 1):
-        # Market Sentiment Index (MSI)
-        if market_event_counter > 0:
-            market_event_counter -= 1  # Continue current market event
-        else:
-            # Decide if a new market event occurs
-            rand_event = random.random()
-            if rand_event < bull_market_probability:
-                current_msi = msi_bull
-                market_event_counter = market_event_duration - 1
-            elif rand_event < bull_market_probability + bear_market_probability:
-                current_msi = msi_bear
-                market_event_counter = market_event_duration - 1
-            else:
-                current_msi = msi_normal
+        # Market Sentiment Index (MSI), precomputed for every month
+        current_msi = market_sentiment[month - 1]
 
-        if month % roadmap_cycle == 0:
-            current_msi *= roadmap_effect
+        # Vesting for builders after lockup period
+        vesting_amount = builders_vesting[month - 1]
+        builders_tokens_remaining = builders_remaining[month - 1]
+        circulating_supply += vesting_amount
 
-            # Vesting for builders after lockup period
-        builders_sold = 0
-        if month > builders_lockup_period and builders_tokens_remaining > 0:
-            vesting_amount = min(builders_vesting_per_month,
-                                 builders_tokens_remaining)
-            builders_tokens_remaining -= vesting_amount
-            circulating_supply += vesting_amount
-
-            # Builders' tokens are now in circulation
-            # Builders sell a percentage of their tokens
-            builders_sold = vesting_amount * builders_selling_percentage
+        # Builders' tokens are now in circulation
+        # Builders sell a percentage of their tokens
+        builders_sold = vesting_amount * builders_selling_percentage
 
         # Vesting for private sales
-        for schedule in private_sales_vesting_schedules:
-            if schedule['vesting_period'] > 0 and schedule['remaining_tokens'] > 0:
-                schedule['current_month'] += 1
-                if schedule['current_month'] <= schedule['vesting_period']:
-                    vesting_amount = min(
-                        schedule['vesting_amount_per_month'],
-                        schedule['remaining_tokens']
-                    )
-                    schedule['remaining_tokens'] -= vesting_amount
-                    private_sale_vesting_tokens_remaining -= vesting_amount
-                    circulating_supply += vesting_amount
-                    # Tokens are now in circulation
+        circulating_supply += private_sales_vesting[month - 1]
+        # Tokens are now in circulation
 
         # Distribute testnet tokens
-        if testnet_development_tokens > 0:
-            testnet_vesting_per_month = testnet_development_tokens / (
-                testnet_distribution_period * 12
-            )
-            vesting_amount = min(testnet_vesting_per_month,
-                                 testnet_development_tokens)
-            testnet_development_tokens -= vesting_amount
-            circulating_supply += vesting_amount
-            # Tokens are now in circulation
+        testnet_development_tokens = testnet_remaining[month - 1]
+        circulating_supply += testnet_vesting[month - 1]
+        # Tokens are now in circulation
 
         # DAO consumes a percentage of its treasury annually, starting after a delay
         if month >= dao_consumption_start_month and dao_treasury > 0:
@@ -205,65 +342,25 @@ def simulate(simulation_months, config):
             circulating_supply += dao_consumed
             # Tokens are now in circulation
 
-        # Ensure circulating supply does not exceed the maximum total supply
-        total_tokens_allocated = (
-            circulating_supply +
-            builders_tokens_remaining +
-            dao_treasury +
-            testnet_development_tokens +
-            initiator_rewards_pool +
-            private_sale_vesting_tokens_remaining
-        )
-
-        if total_tokens_allocated > total_supply:
-            # Adjust circulating supply accordingly
-            excess_tokens = total_tokens_allocated - total_supply
-            circulating_supply -= excess_tokens
-            if circulating_supply < 0:
-                circulating_supply = 0
-
-        # Ensure circulating supply does not go negative
-        if circulating_supply < 0:
-            circulating_supply = 0
-
-        # Calculate baseline number of missions using logistic growth
-        exponent = growth_rate * (month - inflection_point)
-        baseline_missions = carrying_capacity / (1 + np.exp(-exponent))
-
-        # Apply seasonal adjustments
-        month_of_year = (month - 1) % 12 + 1  # Month in [1,12]
-        seasonal_factor = seasonality.get(str(month_of_year), 1.0)
-        adjusted_missions = baseline_missions * seasonal_factor
-
-        # Apply random fluctuations
-        fluctuation = random.uniform(-random_fluctuation, random_fluctuation)
-        final_missions = adjusted_missions * (1 + fluctuation)
-
-        # Convert final_missions to integer
-        num_missions = int(final_missions)
+        # Number of missions, precomputed for every month
+        num_missions = missions[month - 1]
+        num_successful = successful_missions[month - 1]
+        num_failed = num_missions - num_successful
 
         # Initialize monthly metrics
-        tokens_staked = 0
-        tokens_burnt = 0
-        tokens_fee_distributed = 0
-        tokens_fee_to_dao = 0
-        net_token_demand = 0
-        initiator_sold = 0
-        fellowship_sold = 0
+        tokens_staked = 0.0
+        tokens_burnt = 0.0
+        tokens_fee_distributed = 0.0
+        tokens_fee_to_dao = 0.0
+        net_token_demand = 0.0
+        initiator_sold = 0.0
+        fellowship_sold = 0.0
 
         # Process missions in aggregate
         if num_missions > 0:
-            # Determine the number of successful and failed missions
-            num_successful = int(num_missions * mission_success_rate)
-            num_failed = num_missions - num_successful
-
-            # Calculate protocol fee in $POLN
-            protocol_fee_usd = project_cost * protocol_fee_rate
-            protocol_fee_poln = protocol_fee_usd / token_price
-
-            # Ensure protocol_fee_poln doesn't become too small
-            if protocol_fee_poln < 1e-18:
-                protocol_fee_poln = 1e-18
+            # Calculate protocol fee in $POLN, ensuring it doesn't become
+            # too small
+            protocol_fee_poln = max(protocol_fee_usd / token_price, 1e-18)
 
             # Calculate staking amount
             staking_amount = protocol_fee_poln * staking_rate
@@ -275,12 +372,9 @@ def simulate(simulation_months, config):
             # Update total burnt tokens (do not reduce total_supply_current)
             total_burnt_tokens += tokens_burnt
 
-            # Update circulating supply by removing burnt tokens
-            circulating_supply -= tokens_burnt
-
-            # Ensure circulating supply does not go negative
-            if circulating_supply < 0:
-                circulating_supply = 0
+            # Update circulating supply by removing burnt tokens, ensuring it
+            # does not go negative
+            circulating_supply = max(circulating_supply - tokens_burnt, 0.0)
 
             # Tokens fee distributed to fellowship members
             tokens_fee_distributed = protocol_fee_poln * num_successful
@@ -322,73 +416,603 @@ def simulate(simulation_months, config):
             )
 
             # Check for halving
-            halving_threshold = initial_initiator_rewards_pool / \
-                (2 ** (current_halving_index + 1))
+            halving_threshold = halving_table[0, current_halving_index]
             if (
                 current_halving_index < max_halvings and
                 initiator_rewards_pool <= halving_threshold and
                 reward_per_mission > minimum_reward_per_mission
             ):
                 # Halving occurs
-                reward_per_mission /= 2
                 current_halving_index += 1
-                # Ensure reward_per_mission does not go below minimum_reward_per_mission
-                if reward_per_mission < minimum_reward_per_mission:
-                    reward_per_mission = minimum_reward_per_mission
+                reward_per_mission = halving_table[1, current_halving_index]
 
         # Ensure circulating supply does not exceed the maximum total supply
-        total_tokens_allocated = (
-            circulating_supply +
+        # minus the tokens held elsewhere, keeping it non-negative
+        tokens_held = (
             builders_tokens_remaining +
             dao_treasury +
             testnet_development_tokens +
             initiator_rewards_pool +
-            sum(schedule['remaining_tokens']
-                for schedule in private_sales_vesting_schedules)
+            private_sales_schedules_remaining[month - 1]
         )
+        circulating_supply = max(
+            min(circulating_supply, total_supply - tokens_held), 0.0)
 
-        if total_tokens_allocated > total_supply:
-            # Adjust circulating supply accordingly
-            excess_tokens = total_tokens_allocated - total_supply
-            circulating_supply -= excess_tokens
-            if circulating_supply < 0:
-                circulating_supply = 0
-
-        # Adjust token price based on net demand and market sentiment
+        # Adjust token price based on net demand relative to circulating
+        # supply and market sentiment, capping the change to prevent extreme
+        # fluctuations. Without supply (division by zero) or demand, the
+        # price is unchanged
         if circulating_supply > 0 and net_token_demand != 0:
-            demand_supply_ratio = net_token_demand / circulating_supply
-            price_change_percentage = pec * demand_supply_ratio * current_msi
-            # Cap price change percentage to prevent extreme fluctuations
-            price_change_percentage = max(
-                min(price_change_percentage, 0.2), -0.2)
-            token_price *= (1 + price_change_percentage)
-        else:
-            # Avoid division by zero
-            demand_supply_ratio = 0
-            price_change_percentage = 0
-
-        # Store monthly results
-        results.append({
-            'Month': month,
-            'Circulating Supply': circulating_supply,
-            'Total Supply': total_supply_current,
-            'Token Price': token_price,
-            'Tokens Staked': tokens_staked,
-            'Tokens Burnt': tokens_burnt,
-            'Tokens Fee Distributed': tokens_fee_distributed,
-            'Tokens Fee to DAO': tokens_fee_to_dao,
-            'DAO Treasury': dao_treasury,
-            'Total Burnt Tokens': total_burnt_tokens,
-            'Market Sentiment Index': current_msi,
-            'Net Token Demand': net_token_demand,
-            'Missions': num_missions,
-            'Initiator Rewards Pool': initiator_rewards_pool,
-            'Reward per Mission': reward_per_mission,
-            'Halving Index': current_halving_index,
-            'Builders Sold': builders_sold,
-            'Fellowship Sold': fellowship_sold,
-        })
-
-    # Convert results to a pandas DataFrame
-    df = pd.DataFrame(results)
+            token_price *= 1 + max(min(
+                pec * (net_token_demand / circulating_supply) * current_msi,
+                0.2), -0.2)
+
+        # Store monthly results, one row of 'out' per RESULT_COLUMNS entry
+        index = month - 1
+        out[0, index] = month
+        out[1, index] = circulating_supply
+        out[2, index] = total_supply_current
+        out[3, index] = token_price
+        out[4, index] = tokens_staked
+        out[5, index] = tokens_burnt
+        out[6, index] = tokens_fee_distributed
+        out[7, index] = tokens_fee_to_dao
+        out[8, index] = dao_treasury
+        out[9, index] = total_burnt_tokens
+        out[10, index] = current_msi
+        out[11, index] = net_token_demand
+        out[12, index] = num_missions
+        out[13, index] = initiator_rewards_pool
+        out[14, index] = reward_per_mission
+        out[15, index] = current_halving_index
+        out[16, index] = builders_sold
+        out[17, index] = fellowship_sold
+
+
+@njit(parallel=True, cache=True)
+def _simulate_replicates(params, schedules, halving_table,
+                         market_sentiment, missions, successful_missions,
+                         out):
+    """
+    Run independent replicates of the monthly loop in parallel.
+
+    Parameters:
+    - params, schedules, halving_table: inputs shared by all
+      replicates, as returned by '_prepare'.
+    - market_sentiment, missions, successful_missions: arrays of shape
+      (num_replicates, simulation_months), one row per replicate.
+    - out: float64 array of shape
+      (num_replicates, len(RESULT_COLUMNS), simulation_months).
+    """
+    for replicate in prange(out.shape[0]):
+        _simulate_months(params, schedules, halving_table,
+                         market_sentiment[replicate], missions[replicate],
+                         successful_missions[replicate], out[replicate])
+
+
+def _simulate_chunk(params, schedules, halving_table, market_sentiment,
+                    missions, successful_missions):
+    """
+    Run a chunk of replicates in a worker process, see '_run_replicates'.
+
+    Parameters:
+    - params, schedules, halving_table, market_sentiment, missions,
+      successful_missions: inputs of '_simulate_replicates', restricted to
+      the replicates of the chunk.
+
+    Returns:
+    - out: float64 array of shape
+      (replicates, len(RESULT_COLUMNS), simulation_months).
+    """
+    out = np.empty((market_sentiment.shape[0], len(RESULT_COLUMNS),
+                    market_sentiment.shape[1]))
+    _simulate_replicates(params, schedules, halving_table, market_sentiment,
+                         missions, successful_missions, out)
+    return out
+
+
+def _run_replicates(params, schedules, halving_table, market_sentiment,
+                    missions, successful_missions, out):
+    """
+    Run independent replicates of the monthly loop with the fastest loop
+    available.
+
+    With Numba, replicates run in parallel threads. Without it, the
+    ahead-of-time module runs them one after another, and the plain Python
+    loop is spread over one worker process per CPU.
+
+    Parameters:
+    - the arguments of '_simulate_replicates'.
+    """
+    num_replicates = out.shape[0]
+    workers = max(1, min(os.cpu_count() or 1, num_replicates))
+
+    if _HAVE_NUMBA or (_compiled_months is None and workers == 1):
+        _simulate_replicates(params, schedules, halving_table,
+                             market_sentiment, missions, successful_missions,
+                             out)
+    elif _compiled_months is not None:
+        for replicate in range(num_replicates):
+            _compiled_months(params, schedules, halving_table,
+                             market_sentiment[replicate], missions[replicate],
+                             successful_missions[replicate], out[replicate])
+    else:
+        # Consecutive replicates are grouped into one chunk per worker, so
+        # every worker receives its inputs and returns its results once
+        bounds = np.linspace(0, num_replicates, workers + 1).astype(int)
+        chunks = [slice(start, stop)
+                  for start, stop in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(_simulate_chunk, params, schedules,
+                                halving_table, market_sentiment[chunk],
+                                missions[chunk], successful_missions[chunk])
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                out[chunk] = future.result()
+
+
+@lru_cache(maxsize=16)
+def _prepare(simulation_months, cfg):
+    """
+    Derive the deterministic inputs of the monthly loop from the config.
+
+    The inputs only depend on the config and the number of months, so they
+    are cached for repeated runs of the same scenario. The returned arrays
+    are shared between calls and must not be modified.
+
+    Parameters:
+    - simulation_months: int, total number of months to simulate.
+    - cfg: SimConfig, parameters of the simulation.
+
+    Returns:
+    - params: float64 array of the scalars named in KERNEL_PARAMS.
+    - schedules: float64 array with one row per KERNEL_SCHEDULES entry.
+    - halving_table: float64 array of the initiator rewards pool threshold
+      and of the reward per mission of every halving.
+    - adjusted_missions: float64 array, missions expected every month
+      before random fluctuations.
+    """
+    # Extract parameters from the configuration
+    total_supply = cfg.total_supply
+    initial_price = cfg.initial_price
+    project_cost = cfg.project_cost
+    protocol_fee_rate = cfg.protocol_fee_rate
+    staking_rate = cfg.staking_rate
+    pec = cfg.pec  # Price Elasticity Coefficient
+    carrying_capacity = cfg.carrying_capacity
+    growth_rate = cfg.growth_rate
+    inflection_point = cfg.inflection_point
+    token_distribution = dict(cfg.token_distribution)
+    initiator_selling_percentage = cfg.initiator_selling_percentage
+    dao_annual_consumption_rate = cfg.dao_annual_consumption_rate
+    dao_consumption_start_month = cfg.dao_consumption_start_month
+    fellowship_selling_percentage = cfg.fellowship_selling_percentage
+    builders_selling_percentage = cfg.builders_selling_percentage
+    private_sales = cfg.private_sales
+    minimum_reward_per_mission = cfg.minimum_reward_per_mission
+    testnet_distribution_period = cfg.testnet_distribution_period
+    builders_lockup_period = cfg.builders_lockup_period
+    builders_vesting_period = cfg.builders_vesting_period
+
+    # Tokens allocated
+    builders_tokens_total = total_supply * token_distribution['Builders']
+    builders_tokens_remaining = builders_tokens_total
+    dao_treasury = total_supply * token_distribution['DAO Treasury']
+    airdrops_giveaways_tokens = total_supply * \
+        token_distribution['Airdrops & Giveaways']
+    # Initiator rewards pool calculated from token distribution
+    initiator_rewards_pool = total_supply * \
+        token_distribution['Initiator Rewards']
+    testnet_development_tokens = (
+        total_supply * token_distribution['Testnet Development & Partners']
+    )
+
+    # Calculate private sale tokens under vesting
+    private_sale_vesting_tokens_total = sum(
+        tokens_sold for tokens_sold, _ in private_sales
+    )
+    private_sale_vesting_tokens_remaining = private_sale_vesting_tokens_total
+
+    # Circulating supply excludes tokens not immediately available
+    circulating_supply = total_supply - (
+        builders_tokens_remaining +
+        dao_treasury +
+        airdrops_giveaways_tokens +
+        initiator_rewards_pool +
+        testnet_development_tokens +
+        private_sale_vesting_tokens_remaining
+    )
+
+    # Private sales vesting schedules, one array entry per sale
+    sales_tokens = np.array(
+        [tokens_sold for tokens_sold, _ in private_sales], dtype=np.float64)
+    sales_period = np.array(
+        [vesting_period for _, vesting_period in private_sales],
+        dtype=np.int64)
+    sales_per_month = np.array(
+        [tokens_sold / vesting_period if vesting_period > 0 else 0.0
+         for tokens_sold, vesting_period in private_sales], dtype=np.float64)
+    for tokens_sold, vesting_period in private_sales:
+        if vesting_period == 0:
+            # Tokens with no vesting are added to circulating supply immediately
+            circulating_supply += tokens_sold
+
+    token_price = initial_price
+
+    # Builders' tokens vesting per month after lockup
+    builders_vesting_per_month = builders_tokens_total / \
+        builders_vesting_period if builders_vesting_period > 0 else 0
+
+    # DAO consumption tracking
+    dao_consumption_monthly_rate = dao_annual_consumption_rate / \
+        12  # Convert annual rate to monthly
+
+    # Initiator rewards
+    # Start with monthly reward
+    reward_per_mission = cfg.initial_reward_per_mission
+
+    # Compute the maximum number of halvings
+    max_halvings = int(
+        np.floor(np.log2(initiator_rewards_pool /
+                 minimum_reward_per_mission))
+    )
+
+    # Halving table, indexed by the halving index k. The next halving occurs
+    # once the initiator rewards pool has fallen to 1 / 2**(k+1) of its
+    # initial size, and the k-th halving divides the reward per mission by
+    # 2**k, without going below minimum_reward_per_mission
+    halving_powers = 2.0 ** np.arange(max(max_halvings, 0) + 1)
+    halving_table = np.stack([
+        initiator_rewards_pool / (2 * halving_powers),
+        np.maximum(reward_per_mission / halving_powers,
+                   minimum_reward_per_mission),
+    ])
+
+    # Deterministic vesting schedules, indexed by month - 1
+    months = np.arange(1, simulation_months + 1)
+    # Builders' tokens vest linearly after the lockup period
+    builders_vested = np.minimum(
+        np.maximum(months - builders_lockup_period, 0) *
+        builders_vesting_per_month,
+        builders_tokens_total
+    )
+    builders_remaining = builders_tokens_total - builders_vested
+    builders_vesting = np.diff(builders_vested, prepend=0.0)
+    # Every month, testnet tokens vest a fixed share of what remains, all of
+    # it when the distribution period is shorter than a month
+    testnet_remaining = testnet_development_tokens * np.maximum(
+        1 - 1 / (testnet_distribution_period * 12), 0.0
+    ) ** months
+    testnet_vesting = -np.diff(testnet_remaining,
+                               prepend=testnet_development_tokens)
+    # Private sales vest linearly over their vesting period, all sales at
+    # once with one row per sale
+    sales_vested = np.minimum(
+        np.minimum(months, sales_period[:, np.newaxis]) *
+        sales_per_month[:, np.newaxis],
+        sales_tokens[:, np.newaxis]
+    ).sum(axis=0)
+    private_sales_vesting = np.diff(sales_vested, prepend=0.0)
+    # Sales without vesting never leave their schedule
+    private_sales_schedules_remaining = sales_tokens.sum() - sales_vested
+
+    # Seasonal factors indexed by month of year, January first
+    seasonality_factors = np.array(cfg.seasonality, dtype=np.float64)
+
+    # Missions follow a logistic growth curve adjusted for seasonality
+    baseline_missions = carrying_capacity / (
+        1 + np.exp(-growth_rate * (months - inflection_point)))
+    adjusted_missions = (baseline_missions *
+                         seasonality_factors[(months - 1) % 12])
+
+    # Pack the scalars into one float64 vector and the schedules into one
+    # 2-D array, so the loop has a fixed signature whatever the config
+    scalars = {
+        'total_supply': total_supply,
+        'project_cost': project_cost,
+        'protocol_fee_rate': protocol_fee_rate,
+        'staking_rate': staking_rate,
+        'pec': pec,
+        'initiator_selling_percentage': initiator_selling_percentage,
+        'dao_consumption_monthly_rate': dao_consumption_monthly_rate,
+        'dao_consumption_start_month': dao_consumption_start_month,
+        'fellowship_selling_percentage': fellowship_selling_percentage,
+        'builders_selling_percentage': builders_selling_percentage,
+        'minimum_reward_per_mission': minimum_reward_per_mission,
+        'max_halvings': max_halvings,
+        'circulating_supply': circulating_supply,
+        'dao_treasury': dao_treasury,
+        'initiator_rewards_pool': initiator_rewards_pool,
+        'token_price': token_price,
+        'reward_per_mission': reward_per_mission,
+    }
+    params = np.array([scalars[name] for name in KERNEL_PARAMS],
+                      dtype=np.float64)
+    schedules = np.stack([
+        builders_vesting,
+        builders_remaining,
+        testnet_vesting,
+        testnet_remaining,
+        private_sales_vesting,
+        private_sales_schedules_remaining,
+    ])
+    return params, schedules, halving_table, adjusted_missions
+
+
+def _draw_random(rng, size, adjusted_missions, cfg):
+    """
+    Draw the random inputs of the monthly loop.
+
+    Parameters:
+    - rng: numpy.random.Generator, source of randomness.
+    - size: int or tuple, shape of the draws, months last.
+    - adjusted_missions: float64 array returned by '_prepare'.
+    - cfg: SimConfig, parameters of the simulation.
+
+    Returns:
+    - market_sentiment: float64 array of the Market Sentiment Index.
+    - missions: int64 array of missions conducted.
+    - successful_missions: int64 array of successful missions.
+    """
+    random_fluctuation = cfg.random_fluctuation
+
+    # Draw all random numbers up front, in two vectorized calls
+    event_draws = rng.random(size)
+    fluctuations = rng.uniform(-random_fluctuation, random_fluctuation, size)
+
+    # Classify every draw at once: a draw below the bull market probability
+    # starts a bull market, the next bear market probability a bear market
+    bull_market_probability = cfg.bull_market_probability
+    thresholds = np.array([
+        bull_market_probability,
+        bull_market_probability + cfg.bear_market_probability,
+    ])
+    event_types = np.searchsorted(thresholds, event_draws, side='right')
+
+    # Market events are walked through once for every run of months
+    msi_table = np.array(
+        [cfg.msi_bull, cfg.msi_bear, cfg.msi_normal],
+        dtype=np.float64)
+    event_duration = cfg.market_event_duration
+    event_counters = np.array(
+        [event_duration - 1, event_duration - 1, 0], dtype=np.int64)
+    market_sentiment = _market_sentiment(
+        np.atleast_2d(event_types), msi_table, event_counters,
+        float(cfg.roadmap_effect), int(cfg.roadmap_cycle)
+    ).reshape(event_draws.shape)
+
+    # Random fluctuations are applied, then truncated to whole missions
+    missions = (adjusted_missions * (1 + fluctuations)).astype(np.int64)
+    successful_missions = (
+        missions * cfg.mission_success_rate).astype(np.int64)
+    return market_sentiment, missions, successful_missions
+
+
+def _to_dataframe(out, index=None):
+    """
+    Build the results DataFrame from the loop output.
+
+    Parameters:
+    - out: float64 array of shape (len(RESULT_COLUMNS), rows).
+    - index: pandas Index of the rows, defaults to a RangeIndex.
+
+    Returns:
+    - df: pandas DataFrame, one column per RESULT_COLUMNS entry.
+    """
+    return pd.DataFrame(_result_columns(out), index=index, copy=False)
+
+
+def _to_table(out, replicate=None):
+    """
+    Build the results Arrow Table from the loop output.
+
+    Parameters:
+    - out: float64 array of shape (len(RESULT_COLUMNS), rows).
+    - replicate: int32 array, replicate of every row, stored as a leading
+      'Replicate' column when given.
+
+    Returns:
+    - table: pyarrow Table, one column per RESULT_COLUMNS entry.
+    """
+    # pyarrow is imported where it is used, so runs returning DataFrames do
+    # not pay for importing it
+    import pyarrow as pa
+
+    columns = _result_columns(out)
+    if replicate is not None:
+        columns = {'Replicate': replicate, **columns}
+    return pa.table(columns)
+
+
+def _result_columns(out):
+    """
+    Split the loop output into result columns.
+
+    Parameters:
+    - out: float64 array of shape (len(RESULT_COLUMNS), rows).
+
+    Returns:
+    - columns: dict of numpy arrays, keyed by RESULT_COLUMNS entry.
+    """
+    # Reuse the rows of 'out' as columns, converting only those that are
+    # not stored as float64
+    return {
+        column: values.astype(RESULT_DTYPE[column], copy=False)
+        for column, values in zip(RESULT_COLUMNS, out)
+    }
+
+
+def _default_rng(cfg, seed):
+    """
+    Create the default source of randomness of a simulation.
+
+    Parameters:
+    - cfg: SimConfig, parameters of the simulation.
+    - seed: int or None, seed overriding cfg.seed.
+
+    Returns:
+    - rng: numpy.random.Generator, SFC64 generator seeded with 'seed', or
+      with cfg.seed if 'seed' is None (unseeded if both are absent).
+    """
+    if seed is None:
+        seed = cfg.seed
+    return np.random.Generator(np.random.SFC64(seed))
+
+
+def _as_sim_config(config):
+    """
+    Convert a configuration to SimConfig.
+
+    Parameters:
+    - config: SimConfig, or dict loaded from 'config.json'.
+
+    Returns:
+    - cfg: SimConfig, 'config' itself if it already is one.
+    """
+    if isinstance(config, SimConfig):
+        return config
+    return SimConfig.from_dict(config)
+
+
+def _simulate(simulation_months, cfg, rng, as_pandas):
+    """
+    Run the tokenomics simulation, see 'simulate'.
+
+    Parameters:
+    - simulation_months: int, total number of months to simulate.
+    - cfg: SimConfig, parameters of the simulation.
+    - rng: numpy.random.Generator, source of randomness.
+    - as_pandas: bool, whether to return a DataFrame or an Arrow Table.
+
+    Returns:
+    - df: pandas DataFrame or pyarrow Table containing the simulation
+      results.
+    """
+    params, schedules, halving_table, adjusted_missions = _prepare(
+        simulation_months, cfg)
+    market_sentiment, missions, successful_missions = _draw_random(
+        rng, simulation_months, adjusted_missions, cfg)
+
+    # Data storage for simulation results, one contiguous row per column
+    out = np.empty((len(RESULT_COLUMNS), simulation_months))
+    simulate_months = _compiled_months or _simulate_months
+    simulate_months(params, schedules, halving_table, market_sentiment,
+                    missions, successful_missions, out)
+
+    if as_pandas:
+        return _to_dataframe(out)
+    return _to_table(out)
+
+
+@lru_cache(maxsize=16)
+def _simulate_seeded(simulation_months, cfg, seed, as_pandas):
+    """
+    Run a seeded simulation, caching its results.
+
+    Parameters:
+    - simulation_months: int, total number of months to simulate.
+    - cfg: SimConfig, parameters of the simulation.
+    - seed: int, seed of the default generator.
+    - as_pandas: bool, whether to return a DataFrame or an Arrow Table.
+
+    Returns:
+    - df: pandas DataFrame or pyarrow Table containing the simulation
+      results, shared between calls.
+    """
+    df = _simulate(simulation_months, cfg, _default_rng(cfg, seed),
+                   as_pandas)
+    if as_pandas:
+        # Copying groups the columns into one block per dtype, which makes
+        # the copies returned by 'simulate' cheaper
+        df = df.copy()
     return df
+
+
+def simulate(simulation_months, config, rng=None, seed=None,
+             as_pandas=True):
+    """
+    Run the tokenomics simulation for a specified number of months.
+
+    Parameters:
+    - simulation_months: int, total number of months to simulate.
+    - config: SimConfig, parameters of the simulation, or dict of the
+      configuration parameters loaded from 'config.json'.
+    - rng: numpy.random.Generator, source of randomness. Defaults to a new
+      SFC64 generator seeded with 'seed'.
+    - seed: int, seed of the default generator. Defaults to config['seed']
+      (unseeded if absent). Ignored when 'rng' is given.
+    - as_pandas: bool, return a pandas DataFrame (default) or, if False, a
+      pyarrow Table with the same columns.
+
+    Returns:
+    - df: pandas DataFrame or pyarrow Table containing the simulation
+      results.
+    """
+    cfg = _as_sim_config(config)
+    if rng is None:
+        if seed is None:
+            seed = cfg.seed
+        if seed is not None:
+            # Seeded runs always give the same results, so they are cached.
+            # Callers receive their own copy of DataFrames, while Arrow
+            # Tables are immutable and can be shared
+            df = _simulate_seeded(simulation_months, cfg, seed, as_pandas)
+            return df.copy() if as_pandas else df
+        rng = _default_rng(cfg, seed)
+
+    return _simulate(simulation_months, cfg, rng, as_pandas)
+
+
+def simulate_ensemble(num_replicates, simulation_months, config, rng=None,
+                      seed=None, as_pandas=True):
+    """
+    Run independent replicates of the simulation in parallel.
+
+    Replicates run in parallel threads with Numba and in worker processes
+    without it (unless the ahead-of-time module is built). Scripts calling
+    it without Numba must guard their entry point with
+    "if __name__ == '__main__':" on platforms that spawn worker processes,
+    such as Windows and macOS.
+
+    Parameters:
+    - num_replicates: int, number of replicates to run.
+    - simulation_months: int, total number of months to simulate.
+    - config: SimConfig, parameters of the simulation, or dict of the
+      configuration parameters loaded from 'config.json'.
+    - rng: numpy.random.Generator, source of randomness shared by all
+      replicates. Defaults to a new SFC64 generator seeded with 'seed'.
+    - seed: int, seed of the default generator. Defaults to config['seed']
+      (unseeded if absent). Ignored when 'rng' is given.
+    - as_pandas: bool, return a pandas DataFrame (default) or, if False, a
+      pyarrow Table with a leading 'Replicate' column.
+
+    Returns:
+    - df: pandas DataFrame containing the results of every replicate,
+      indexed by (Replicate, row). 'df.loc[replicate]' has the layout
+      returned by 'simulate'. A pyarrow Table if 'as_pandas' is False.
+    """
+    cfg = _as_sim_config(config)
+    if rng is None:
+        rng = _default_rng(cfg, seed)
+
+    params, schedules, halving_table, adjusted_missions = _prepare(
+        simulation_months, cfg)
+    market_sentiment, missions, successful_missions = _draw_random(
+        rng, (num_replicates, simulation_months), adjusted_missions, cfg)
+
+    out = np.empty((num_replicates, len(RESULT_COLUMNS), simulation_months))
+    _run_replicates(params, schedules, halving_table,
+                    market_sentiment, missions, successful_missions, out)
+
+    # Replicates are stacked one after another in every column
+    stacked = out.transpose(1, 0, 2).reshape(len(RESULT_COLUMNS), -1)
+    if not as_pandas:
+        replicate = np.repeat(
+            np.arange(num_replicates, dtype=np.int32), simulation_months)
+        return _to_table(stacked, replicate)
+    index = pd.MultiIndex.from_product(
+        [range(num_replicates), range(simulation_months)],
+        names=['Replicate', None])
+    return _to_dataframe(stacked, index)
@@ -0,0 +1,363 @@
+"""
+test_simulation.py
+
+Checks the simulation against a plain Python reference of the original
+month-by-month loop, fed the same random draws. Single-month amounts are
+stored in single precision, so results are compared within float32
+tolerance.
+
+Usage:
+    python -m unittest test_simulation
+"""
+
+import copy
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+import orjson
+import simulation
+from simulation import simulate, simulate_ensemble
+
+# Relative tolerance of the comparisons, a few float32 ulps
+RTOL = 1e-6
+
+
+def reference_simulate(simulation_months, config, event_draws, fluctuations):
+    """
+    Run the original simulation loop with given random draws.
+
+    Parameters:
+    - simulation_months: int, total number of months to simulate.
+    - config: dict, configuration parameters loaded from 'config.json'.
+    - event_draws: float64 array, market event draw of every month, used
+      when no event is ongoing.
+    - fluctuations: float64 array, mission fluctuation of every month.
+
+    Returns:
+    - results: dict of float64 arrays, one per RESULT_COLUMNS entry.
+    """
+    total_supply = config['total_supply']
+    token_distribution = config['token_distribution']
+    private_sales = config['private_sales']
+    minimum_reward_per_mission = config['minimum_reward_per_mission']
+    builders_lockup_period = config['builders_lockup_period']
+    builders_vesting_period = config['builders_vesting_period']
+    bull_market_probability = config['bull_market_probability']
+    bear_market_probability = config['bear_market_probability']
+
+    builders_tokens_total = total_supply * token_distribution['Builders']
+    builders_tokens_remaining = builders_tokens_total
+    dao_treasury = total_supply * token_distribution['DAO Treasury']
+    airdrops_giveaways_tokens = (
+        total_supply * token_distribution['Airdrops & Giveaways'])
+    initiator_rewards_pool = (
+        total_supply * token_distribution['Initiator Rewards'])
+    testnet_development_tokens = (
+        total_supply * token_distribution['Testnet Development & Partners'])
+
+    private_sale_vesting_tokens_remaining = sum(
+        sale['tokens_sold'] for sale in private_sales)
+    circulating_supply = total_supply - (
+        builders_tokens_remaining +
+        dao_treasury +
+        airdrops_giveaways_tokens +
+        initiator_rewards_pool +
+        testnet_development_tokens +
+        private_sale_vesting_tokens_remaining
+    )
+
+    schedules = []
+    for sale in private_sales:
+        vesting_period = sale['vesting_period']
+        tokens_sold = sale['tokens_sold']
+        schedules.append({
+            'remaining_tokens': tokens_sold,
+            'vesting_period': vesting_period,
+            'vesting_amount_per_month': (
+                tokens_sold / vesting_period if vesting_period > 0 else 0),
+            'current_month': 0,
+        })
+        if vesting_period == 0:
+            circulating_supply += tokens_sold
+            private_sale_vesting_tokens_remaining -= tokens_sold
+
+    total_burnt_tokens = 0
+    token_price = config['initial_price']
+    builders_vesting_per_month = (
+        builders_tokens_total / builders_vesting_period
+        if builders_vesting_period > 0 else 0)
+    dao_consumption_monthly_rate = config['dao_annual_consumption_rate'] / 12
+    reward_per_mission = config['initiator_rewards_initial']['monthly']
+    initial_initiator_rewards_pool = initiator_rewards_pool
+    current_halving_index = 0
+    max_halvings = int(np.floor(np.log2(
+        initial_initiator_rewards_pool / minimum_reward_per_mission)))
+
+    market_event_counter = 0
+    current_msi = config['msi_normal']
+    results = {column: np.empty(simulation_months)
+               for column in simulation.RESULT_COLUMNS}
+
+    for month in range(1, simulation_months + 1):
+        if market_event_counter > 0:
+            market_event_counter -= 1
+        else:
+            rand_event = event_draws[month - 1]
+            if rand_event < bull_market_probability:
+                current_msi = config['msi_bull']
+                market_event_counter = config['market_event_duration'] - 1
+            elif rand_event < (bull_market_probability +
+                               bear_market_probability):
+                current_msi = config['msi_bear']
+                market_event_counter = config['market_event_duration'] - 1
+            else:
+                current_msi = config['msi_normal']
+
+        if month % config['roadmap_cycle'] == 0:
+            current_msi *= config['roadmap_effect']
+
+        builders_sold = 0
+        if month > builders_lockup_period and builders_tokens_remaining > 0:
+            vesting_amount = min(builders_vesting_per_month,
+                                 builders_tokens_remaining)
+            builders_tokens_remaining -= vesting_amount
+            circulating_supply += vesting_amount
+            builders_sold = (vesting_amount *
+                             config['builders_selling_percentage'])
+
+        for schedule in schedules:
+            if (schedule['vesting_period'] > 0 and
+                    schedule['remaining_tokens'] > 0):
+                schedule['current_month'] += 1
+                if schedule['current_month'] <= schedule['vesting_period']:
+                    vesting_amount = min(schedule['vesting_amount_per_month'],
+                                         schedule['remaining_tokens'])
+                    schedule['remaining_tokens'] -= vesting_amount
+                    private_sale_vesting_tokens_remaining -= vesting_amount
+                    circulating_supply += vesting_amount
+
+        if testnet_development_tokens > 0:
+            testnet_vesting_per_month = testnet_development_tokens / (
+                config['testnet_distribution_period'] * 12)
+            vesting_amount = min(testnet_vesting_per_month,
+                                 testnet_development_tokens)
+            testnet_development_tokens -= vesting_amount
+            circulating_supply += vesting_amount
+
+        if (month >= config['dao_consumption_start_month'] and
+                dao_treasury > 0):
+            dao_consumed = min(dao_treasury * dao_consumption_monthly_rate,
+                               dao_treasury)
+            dao_treasury -= dao_consumed
+            circulating_supply += dao_consumed
+
+        total_tokens_allocated = (
+            circulating_supply + builders_tokens_remaining + dao_treasury +
+            testnet_development_tokens + initiator_rewards_pool +
+            private_sale_vesting_tokens_remaining)
+        if total_tokens_allocated > total_supply:
+            circulating_supply -= total_tokens_allocated - total_supply
+        circulating_supply = max(circulating_supply, 0)
+
+        exponent = config['growth_rate'] * (month - config['inflection_point'])
+        baseline_missions = (config['carrying_capacity'] /
+                             (1 + np.exp(-exponent)))
+        seasonal_factor = config['seasonality'].get(
+            str((month - 1) % 12 + 1), 1.0)
+        num_missions = int(baseline_missions * seasonal_factor *
+                           (1 + fluctuations[month - 1]))
+
+        tokens_staked = 0
+        tokens_burnt = 0
+        tokens_fee_distributed = 0
+        tokens_fee_to_dao = 0
+        net_token_demand = 0
+        fellowship_sold = 0
+
+        if num_missions > 0:
+            num_successful = int(num_missions * config['mission_success_rate'])
+            num_failed = num_missions - num_successful
+
+            protocol_fee_poln = max(
+                config['project_cost'] * config['protocol_fee_rate'] /
+                token_price, 1e-18)
+            staking_amount = protocol_fee_poln * config['staking_rate']
+
+            tokens_staked = staking_amount * num_missions
+            tokens_burnt = staking_amount * num_failed
+            total_burnt_tokens += tokens_burnt
+            circulating_supply = max(circulating_supply - tokens_burnt, 0)
+
+            tokens_fee_distributed = protocol_fee_poln * num_successful
+            tokens_fee_to_dao = protocol_fee_poln * num_failed
+            dao_treasury += tokens_fee_to_dao
+
+            fellowship_sold = (tokens_fee_distributed *
+                               config['fellowship_selling_percentage'])
+            circulating_supply += tokens_fee_distributed
+
+            initiator_rewards_this_month = min(
+                reward_per_mission * num_successful, initiator_rewards_pool)
+            initiator_rewards_pool -= initiator_rewards_this_month
+            circulating_supply += initiator_rewards_this_month
+            initiator_sold = (initiator_rewards_this_month *
+                              config['initiator_selling_percentage'])
+
+            net_token_demand = (
+                (protocol_fee_poln * num_missions)
+                - tokens_burnt
+                - initiator_sold
+                - fellowship_sold
+                - builders_sold
+            )
+
+            halving_threshold = (initial_initiator_rewards_pool /
+                                 (2 ** (current_halving_index + 1)))
+            if (current_halving_index < max_halvings and
+                    initiator_rewards_pool <= halving_threshold and
+                    reward_per_mission > minimum_reward_per_mission):
+                reward_per_mission = max(reward_per_mission / 2,
+                                         minimum_reward_per_mission)
+                current_halving_index += 1
+
+        total_tokens_allocated = (
+            circulating_supply + builders_tokens_remaining + dao_treasury +
+            testnet_development_tokens + initiator_rewards_pool +
+            sum(schedule['remaining_tokens'] for schedule in schedules))
+        if total_tokens_allocated > total_supply:
+            circulating_supply = max(
+                circulating_supply - (total_tokens_allocated - total_supply),
+                0)
+
+        if circulating_supply > 0 and net_token_demand != 0:
+            demand_supply_ratio = net_token_demand / circulating_supply
+            price_change_percentage = (config['pec'] * demand_supply_ratio *
+                                       current_msi)
+            token_price *= 1 + max(min(price_change_percentage, 0.2), -0.2)
+
+        row = (month, circulating_supply, total_supply, token_price,
+               tokens_staked, tokens_burnt, tokens_fee_distributed,
+               tokens_fee_to_dao, dao_treasury, total_burnt_tokens,
+               current_msi, net_token_demand, num_missions,
+               initiator_rewards_pool, reward_per_mission,
+               current_halving_index, builders_sold, fellowship_sold)
+        for column, value in zip(simulation.RESULT_COLUMNS, row):
+            results[column][month - 1] = value
+
+    return results
+
+
+def _rng(seed):
+    """Generator of the same type as the simulation's default one."""
+    return np.random.Generator(np.random.SFC64(seed))
+
+
+def _draws(seed, size, config):
+    """Random draws made by the simulation from a generator seeded with
+    'seed', in the same order: event draws, then mission fluctuations."""
+    rng = _rng(seed)
+    event_draws = rng.random(size)
+    random_fluctuation = config['random_fluctuation']
+    fluctuations = rng.uniform(-random_fluctuation, random_fluctuation, size)
+    return event_draws, fluctuations
+
+
+def _plain_python():
+    """Patch the compiled loops with their plain Python versions."""
+    patches = [mock.patch.object(simulation, '_compiled_months', None)]
+    for name in ('_market_sentiment', '_simulate_months',
+                 '_simulate_replicates'):
+        func = getattr(simulation, name)
+        patches.append(mock.patch.object(
+            simulation, name, getattr(func, 'py_func', func)))
+    return patches
+
+
+class SimulationTest(unittest.TestCase):
+    """Compare the simulation with the reference loop."""
+
+    @classmethod
+    def setUpClass(cls):
+        config_path = Path(__file__).with_name('config.json')
+        with config_path.open('rb') as config_file:
+            base = orjson.loads(config_file.read())
+
+        def variant(**changes):
+            config = copy.deepcopy(base)
+            config.update(changes)
+            return config
+
+        cls.configs = {
+            'default': base,
+            'no private sales': variant(private_sales=[]),
+            'no builders vesting': variant(builders_vesting_period=0),
+            'sub-month testnet period': variant(
+                testnet_distribution_period=0.05),
+            'frequent market events': variant(bull_market_probability=0.3,
+                                              bear_market_probability=0.4),
+            'large fluctuations': variant(random_fluctuation=1.5),
+            'large minimum reward': variant(minimum_reward_per_mission=50.0),
+        }
+
+    def assert_matches(self, df, expected):
+        """Check every result column against the reference."""
+        for column in simulation.RESULT_COLUMNS:
+            actual = df[column].to_numpy(np.float64)
+            # Values crossing zero are compared relative to the column
+            atol = RTOL * np.max(np.abs(expected[column]), initial=0.0)
+            np.testing.assert_allclose(actual, expected[column], rtol=RTOL,
+                                       atol=atol, err_msg=column)
+
+    def check_simulate(self, simulation_months):
+        for name, config in self.configs.items():
+            with self.subTest(config=name):
+                df = simulate(simulation_months, config, rng=_rng(1))
+                expected = reference_simulate(
+                    simulation_months, config,
+                    *_draws(1, simulation_months, config))
+                self.assertEqual(len(df), simulation_months)
+                self.assert_matches(df, expected)
+
+    def test_simulate(self):
+        self.check_simulate(1000)
+
+    def test_simulate_plain_python(self):
+        patches = _plain_python()
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.check_simulate(120)
+
+    def test_simulate_ensemble(self):
+        num_replicates, simulation_months = 4, 120
+        for name, config in self.configs.items():
+            with self.subTest(config=name):
+                df = simulate_ensemble(num_replicates, simulation_months,
+                                       config, rng=_rng(2))
+                event_draws, fluctuations = _draws(
+                    2, (num_replicates, simulation_months), config)
+                for replicate in range(num_replicates):
+                    expected = reference_simulate(
+                        simulation_months, config, event_draws[replicate],
+                        fluctuations[replicate])
+                    self.assert_matches(df.loc[replicate], expected)
+
+    def test_seeded_runs_repeat(self):
+        config = self.configs['default']
+        first = simulate(60, config, seed=3)
+        # Cached results are copies, changes do not leak into later calls
+        first['Token Price'] = 0.0
+        second = simulate(60, config, seed=3)
+        self.assertTrue(simulate(60, config, rng=_rng(3)).equals(second))
+
+    def test_zero_months(self):
+        config = self.configs['default']
+        self.assertEqual(simulate(0, config).shape,
+                         (0, len(simulation.RESULT_COLUMNS)))
+        self.assertEqual(simulate_ensemble(0, 12, config).shape,
+                         (0, len(simulation.RESULT_COLUMNS)))
+
+
+if __name__ == '__main__':
+    unittest.main()